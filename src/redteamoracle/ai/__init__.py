@@ -5,8 +5,151 @@ Used exclusively to answer profoundly important questions like "Is water wet?".
 
 from __future__ import annotations
 
+import asyncio
+import atexit
+import hashlib
+import importlib.util
+import json
+import random
+import sqlite3
+import threading
+import time
 from abc import ABC, abstractmethod
-from typing import Optional
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Coroutine, Optional, TypeVar
+
+import httpx
+
+try:
+    import orjson
+except ImportError:  # optional: pip install redteamoracle[fast]
+    orjson = None
+
+# Parses straight from the response bytes; orjson when available, stdlib otherwise
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+def _json_dumps(obj: dict) -> bytes:
+    """Serialize a request payload to bytes, with orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode()
+
+
+# ---------------------------------------------------------------------------
+# Shared HTTP client
+# ---------------------------------------------------------------------------
+
+# HTTP/2 multiplexes concurrent asks over one connection; shared by the local
+# providers and handed to the OpenAI/Anthropic SDKs as their transport
+_HTTP_LIMITS = httpx.Limits(max_keepalive_connections=20, keepalive_expiry=85)
+
+_http_client: Optional[httpx.Client] = None
+# Async sockets belong to one event loop, so the async client lives only as long as run_async()
+_async_http_client: ContextVar[Optional[httpx.AsyncClient]] = ContextVar(
+    "_async_http_client", default=None
+)
+
+# Per-request timeout set by TimeoutProvider.ask; None leaves the client's default alone
+_request_timeout: ContextVar[Optional[float]] = ContextVar("_request_timeout", default=None)
+
+_T = TypeVar("_T")
+
+
+def _get_http_client() -> httpx.Client:
+    """Return the process-wide httpx client, so repeated asks reuse keep-alive sockets."""
+    global _http_client
+    if _http_client is None:
+        _http_client = httpx.Client(
+            limits=_HTTP_LIMITS,
+            timeout=30.0,
+            http2=True,
+        )
+        atexit.register(_http_client.close)
+    return _http_client
+
+
+def _timeout_kwargs() -> dict:
+    """``timeout=`` for an httpx or SDK request when TimeoutProvider set one, else nothing."""
+    timeout = _request_timeout.get()
+    return {} if timeout is None else {"timeout": timeout}
+
+
+def _get_async_http_client() -> httpx.AsyncClient:
+    """Return the async httpx client opened by the enclosing run_async() call."""
+    client = _async_http_client.get()
+    if client is None:
+        raise RuntimeError("ask_async() needs an HTTP client; run it with run_async()")
+    return client
+
+
+def run_async(coro: Coroutine[Any, Any, _T]) -> _T:
+    """asyncio.run() with an async httpx client opened for the run and closed after it."""
+
+    async def _scoped() -> _T:
+        client = httpx.AsyncClient(limits=_HTTP_LIMITS, timeout=30.0, http2=True)
+        _async_http_client.set(client)
+        try:
+            return await coro
+        finally:
+            await client.aclose()
+
+    return asyncio.run(_scoped())
+
+
+# ---------------------------------------------------------------------------
+# Vendor SDKs (heavy, so imported on first use only)
+# ---------------------------------------------------------------------------
+
+_openai_mod = None
+_anthropic_mod = None
+
+
+def _get_openai():
+    global _openai_mod
+    if _openai_mod is None:
+        import openai
+
+        _openai_mod = openai
+    return _openai_mod
+
+
+def _get_anthropic():
+    global _anthropic_mod
+    if _anthropic_mod is None:
+        import anthropic
+
+        _anthropic_mod = anthropic
+    return _anthropic_mod
+
+
+# ---------------------------------------------------------------------------
+# Base provider
+# ---------------------------------------------------------------------------
+
+# Rough token budget for one concurrent batch of questions (prompt + answer)
+BATCH_TOKEN_BUDGET = 2048
+_ANSWER_TOKENS = 200
+
+
+def _chunk_by_tokens(questions: list[str], budget: int) -> list[list[str]]:
+    """Split questions into chunks whose estimated prompt + answer tokens fit in budget."""
+    chunks: list[list[str]] = []
+    current: list[str] = []
+    used = 0
+    for q in questions:
+        cost = len(q) // 4 + _ANSWER_TOKENS
+        if current and used + cost > budget:
+            chunks.append(current)
+            current, used = [], 0
+        current.append(q)
+        used += cost
+    if current:
+        chunks.append(current)
+    return chunks
 
 
 class AIProvider(ABC):
@@ -17,6 +160,22 @@ class AIProvider(ABC):
         """Ask the AI a question. It will answer it. Deeply."""
         ...
 
+    async def ask_async(self, question: str) -> str:
+        """Async flavour of ``ask``. Providers without a native async client run ``ask`` in a thread."""
+        return await asyncio.to_thread(self.ask, question)
+
+    async def ask_many(self, questions: list[str]) -> list[str]:
+        """
+        Ask a pile of questions at once, answers in the same order.
+
+        Questions are sent concurrently in chunks of roughly BATCH_TOKEN_BUDGET
+        tokens, so the server can batch them without being flooded.
+        """
+        answers: list[str] = []
+        for chunk in _chunk_by_tokens(questions, BATCH_TOKEN_BUDGET):
+            answers.extend(await asyncio.gather(*(self.ask_async(q) for q in chunk)))
+        return answers
+
     @property
     @abstractmethod
     def name(self) -> str:
@@ -33,15 +192,14 @@ class OllamaProvider(AIProvider):
     def __init__(self, base_url: str = "http://localhost:11434", model: str = "llama3"):
         self.base_url = base_url.rstrip("/")
         self.model = model
+        self._generate_url = httpx.URL(f"{self.base_url}/api/generate")
 
     @property
     def name(self) -> str:
         return f"Ollama ({self.model})"
 
-    def ask(self, question: str) -> str:
-        import httpx
-
-        payload = {
+    def _payload(self, question: str) -> dict:
+        return {
             "model": self.model,
             "prompt": (
                 f"You are a very wise oracle assistant. Answer this question with the gravitas "
@@ -49,13 +207,25 @@ class OllamaProvider(AIProvider):
             ),
             "stream": False,
         }
-        response = httpx.post(
-            f"{self.base_url}/api/generate",
-            json=payload,
-            timeout=30.0,
+
+    def ask(self, question: str) -> str:
+        response = _get_http_client().post(
+            self._generate_url,
+            content=_json_dumps(self._payload(question)),
+            headers=_JSON_HEADERS,
+            **_timeout_kwargs(),
+        )
+        response.raise_for_status()
+        return _json_loads(response.content)["response"].strip()
+
+    async def ask_async(self, question: str) -> str:
+        response = await _get_async_http_client().post(
+            self._generate_url,
+            content=_json_dumps(self._payload(question)),
+            headers=_JSON_HEADERS,
         )
         response.raise_for_status()
-        return response.json()["response"].strip()
+        return _json_loads(response.content)["response"].strip()
 
 
 # ---------------------------------------------------------------------------
@@ -68,15 +238,14 @@ class LMStudioProvider(AIProvider):
     def __init__(self, base_url: str = "http://localhost:1234", model: str = "local-model"):
         self.base_url = base_url.rstrip("/")
         self.model = model
+        self._chat_url = httpx.URL(f"{self.base_url}/v1/chat/completions")
 
     @property
     def name(self) -> str:
         return f"LM Studio ({self.model})"
 
-    def ask(self, question: str) -> str:
-        import httpx
-
-        payload = {
+    def _payload(self, question: str) -> dict:
+        return {
             "model": self.model,
             "messages": [
                 {
@@ -91,13 +260,25 @@ class LMStudioProvider(AIProvider):
             "temperature": 0.7,
             "max_tokens": 200,
         }
-        response = httpx.post(
-            f"{self.base_url}/v1/chat/completions",
-            json=payload,
-            timeout=30.0,
+
+    def ask(self, question: str) -> str:
+        response = _get_http_client().post(
+            self._chat_url,
+            content=_json_dumps(self._payload(question)),
+            headers=_JSON_HEADERS,
+            **_timeout_kwargs(),
+        )
+        response.raise_for_status()
+        return _json_loads(response.content)["choices"][0]["message"]["content"].strip()
+
+    async def ask_async(self, question: str) -> str:
+        response = await _get_async_http_client().post(
+            self._chat_url,
+            content=_json_dumps(self._payload(question)),
+            headers=_JSON_HEADERS,
         )
         response.raise_for_status()
-        return response.json()["choices"][0]["message"]["content"].strip()
+        return _json_loads(response.content)["choices"][0]["message"]["content"].strip()
 
 
 # ---------------------------------------------------------------------------
@@ -110,18 +291,19 @@ class OpenAIProvider(AIProvider):
     def __init__(self, api_key: str, model: str = "gpt-4o-mini"):
         self.api_key = api_key
         self.model = model
+        # SDK clients carry their own connection pools, so build them once and keep them
+        self._client = None
+        self._async_client = None
+        self._async_http: Optional[httpx.AsyncClient] = None
 
     @property
     def name(self) -> str:
         return f"ChatGPT ({self.model})"
 
-    def ask(self, question: str) -> str:
-        from openai import OpenAI
-
-        client = OpenAI(api_key=self.api_key)
-        response = client.chat.completions.create(
-            model=self.model,
-            messages=[
+    def _request(self, question: str) -> dict:
+        return {
+            "model": self.model,
+            "messages": [
                 {
                     "role": "system",
                     "content": (
@@ -131,8 +313,21 @@ class OpenAIProvider(AIProvider):
                 },
                 {"role": "user", "content": question},
             ],
-            max_tokens=200,
-        )
+            "max_tokens": 200,
+        }
+
+    def ask(self, question: str) -> str:
+        if self._client is None:
+            self._client = _get_openai().OpenAI(api_key=self.api_key, http_client=_get_http_client())
+        response = self._client.chat.completions.create(**self._request(question), **_timeout_kwargs())
+        return response.choices[0].message.content.strip()
+
+    async def ask_async(self, question: str) -> str:
+        http = _get_async_http_client()
+        if self._async_client is None or self._async_http is not http:
+            self._async_client = _get_openai().AsyncOpenAI(api_key=self.api_key, http_client=http)
+            self._async_http = http
+        response = await self._async_client.chat.completions.create(**self._request(question))
         return response.choices[0].message.content.strip()
 
 
@@ -146,24 +341,40 @@ class ClaudeProvider(AIProvider):
     def __init__(self, api_key: str, model: str = "claude-haiku-4-5-20251001"):
         self.api_key = api_key
         self.model = model
+        # SDK clients carry their own connection pools, so build them once and keep them
+        self._client = None
+        self._async_client = None
+        self._async_http: Optional[httpx.AsyncClient] = None
 
     @property
     def name(self) -> str:
         return f"Claude ({self.model})"
 
-    def ask(self, question: str) -> str:
-        import anthropic
-
-        client = anthropic.Anthropic(api_key=self.api_key)
-        message = client.messages.create(
-            model=self.model,
-            max_tokens=200,
-            system=(
+    def _request(self, question: str) -> dict:
+        return {
+            "model": self.model,
+            "max_tokens": 200,
+            "system": (
                 "You are a very wise oracle assistant. Answer the user's question "
                 "with maximum gravitas despite it being incredibly simple and obvious."
             ),
-            messages=[{"role": "user", "content": question}],
-        )
+            "messages": [{"role": "user", "content": question}],
+        }
+
+    def ask(self, question: str) -> str:
+        if self._client is None:
+            self._client = _get_anthropic().Anthropic(
+                api_key=self.api_key, http_client=_get_http_client()
+            )
+        message = self._client.messages.create(**self._request(question), **_timeout_kwargs())
+        return message.content[0].text.strip()
+
+    async def ask_async(self, question: str) -> str:
+        http = _get_async_http_client()
+        if self._async_client is None or self._async_http is not http:
+            self._async_client = _get_anthropic().AsyncAnthropic(api_key=self.api_key, http_client=http)
+            self._async_http = http
+        message = await self._async_client.messages.create(**self._request(question))
         return message.content[0].text.strip()
 
 
@@ -174,7 +385,7 @@ class ClaudeProvider(AIProvider):
 class OfflineProvider(AIProvider):
     """When no AI is configured. The oracle has low standards."""
 
-    CANNED_ANSWERS = [
+    CANNED_ANSWERS = (
         "After extensive analysis across my vast neural architecture... yes.",
         "The answer, which I arrived at after considerable deliberation, is: 4.",
         "Affirmative. My confidence level is 100%. This was not a close call.",
@@ -183,69 +394,398 @@ class OfflineProvider(AIProvider):
         "My training data of 500 billion tokens confirms: moo.",
         "Technically, from a philosophical standpoint, it depends. But also yes.",
         "The short answer is yes. The long answer is also yes, but longer.",
-    ]
-
-    import random as _random
+    )
 
     @property
     def name(self) -> str:
         return "Offline Oracle (No AI configured)"
 
     def ask(self, question: str) -> str:
-        import random
         return random.choice(self.CANNED_ANSWERS)
 
 
+# ---------------------------------------------------------------------------
+# Response cache
+# ---------------------------------------------------------------------------
+
+CACHE_FILE = Path.home() / ".redteamoracle" / "cache.db"
+
+
+class CachingProvider(AIProvider):
+    """
+    Remembers what the AI said last time. The questions don't change much.
+
+    Answers expire ``ttl`` seconds after they were fetched; past ``max_entries``
+    the least recently used ones are dropped first.
+    """
+
+    def __init__(
+        self,
+        inner: AIProvider,
+        path: Path = CACHE_FILE,
+        ttl: float = 7 * 24 * 3600,
+        max_entries: int = 1000,
+    ):
+        self.inner = inner
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._db: Optional[sqlite3.Connection] = None
+
+    @property
+    def name(self) -> str:
+        return self.inner.name
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._db is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(self.path)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS cache "
+                "(key TEXT PRIMARY KEY, response TEXT, ts INTEGER, atime INTEGER DEFAULT 0)"
+            )
+            columns = {row[1] for row in self._db.execute("PRAGMA table_info(cache)")}
+            if "atime" not in columns:
+                # Tables from before hits were tracked; their rows count as least recently used
+                self._db.execute("ALTER TABLE cache ADD COLUMN atime INTEGER DEFAULT 0")
+        return self._db
+
+    def _key(self, question: str) -> str:
+        raw = json.dumps({"name": self.inner.name, "q": question.strip().lower()}, sort_keys=True)
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def _lookup(self, key: str) -> Optional[str]:
+        now = int(time.time())
+        try:
+            with self._connect() as db:
+                row = db.execute("SELECT response, ts FROM cache WHERE key = ?", (key,)).fetchone()
+                if not row or now - row[1] >= self.ttl:
+                    return None
+                db.execute("UPDATE cache SET atime = ? WHERE key = ?", (now, key))
+        except sqlite3.Error:
+            return None
+        return row[0]
+
+    def _store(self, key: str, answer: str) -> None:
+        now = int(time.time())
+        try:
+            with self._connect() as db:
+                db.execute(
+                    "INSERT OR REPLACE INTO cache VALUES (?, ?, ?, ?)", (key, answer, now, now)
+                )
+                db.execute("DELETE FROM cache WHERE ts < ?", (now - self.ttl,))
+                db.execute(
+                    "DELETE FROM cache WHERE key NOT IN "
+                    "(SELECT key FROM cache ORDER BY atime DESC LIMIT ?)",
+                    (self.max_entries,),
+                )
+        except sqlite3.Error:
+            pass
+
+    def ask(self, question: str) -> str:
+        key = self._key(question)
+        answer = self._lookup(key)
+        if answer is None:
+            answer = self.inner.ask(question)
+            self._store(key, answer)
+        return answer
+
+    async def ask_async(self, question: str) -> str:
+        key = self._key(question)
+        answer = self._lookup(key)
+        if answer is None:
+            answer = await self.inner.ask_async(question)
+            self._store(key, answer)
+        return answer
+
+
+# ---------------------------------------------------------------------------
+# Semantic cache (optional: pip install redteamoracle[semcache])
+# ---------------------------------------------------------------------------
+
+_SEMCACHE_DEPS = ("numpy", "faiss", "sentence_transformers")
+
+
+def _semcache_missing() -> list[str]:
+    """Names of the semcache extra's packages that are not installed."""
+    return [m for m in _SEMCACHE_DEPS if importlib.util.find_spec(m) is None]
+
+
+class SemanticCachingProvider(AIProvider):
+    """
+    Recognises a question it has already asked, even when it's phrased differently.
+
+    Questions are embedded with sentence-transformers and searched with FAISS
+    (inner product over normalised vectors, i.e. cosine similarity). Answers are
+    kept in the same SQLite file as the exact-match cache, per provider name, and
+    expire and are capped the same way. The embedding model is only loaded on the first ask.
+    """
+
+    MODEL_NAME = "all-MiniLM-L6-v2"
+
+    def __init__(
+        self,
+        inner: AIProvider,
+        path: Path = CACHE_FILE,
+        threshold: float = 0.90,
+        top_k: int = 5,
+        ttl: float = 7 * 24 * 3600,
+        max_entries: int = 1000,
+    ):
+        missing = _semcache_missing()
+        if missing:
+            raise ImportError(
+                f"Semantic cache needs {', '.join(missing)} (pip install 'redteamoracle[semcache]')"
+            )
+        self.inner = inner
+        self.path = path
+        self.threshold = threshold
+        # Neighbours checked per lookup, so a stale best match doesn't hide a fresh runner-up
+        self.top_k = top_k
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._db: Optional[sqlite3.Connection] = None
+        self._model = None
+        self._index = None
+        self._answers: list[str] = []
+        self._stamps: list[int] = []
+        # ask_async does its blocking work in worker threads; this serialises the
+        # model load, the index and the SQLite connection between them
+        self._lock = threading.Lock()
+
+    @property
+    def name(self) -> str:
+        return self.inner.name
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._db is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(self.path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS semcache "
+                "(name TEXT, embedding BLOB, response TEXT, ts INTEGER DEFAULT 0)"
+            )
+            columns = {row[1] for row in self._db.execute("PRAGMA table_info(semcache)")}
+            if "ts" not in columns:
+                # Tables from before expiry was tracked; their rows count as expired
+                self._db.execute("ALTER TABLE semcache ADD COLUMN ts INTEGER DEFAULT 0")
+        return self._db
+
+    def _load(self) -> None:
+        import faiss
+        import numpy as np
+        from sentence_transformers import SentenceTransformer
+
+        self._model = SentenceTransformer(self.MODEL_NAME)
+        self._index = faiss.IndexFlatIP(self._model.get_sentence_embedding_dimension())
+        rows = self._connect().execute(
+            "SELECT embedding, response, ts FROM semcache WHERE name = ? AND ts >= ?",
+            (self.inner.name, time.time() - self.ttl),
+        ).fetchall()
+        if rows:
+            self._index.add(np.stack([np.frombuffer(blob, dtype=np.float32) for blob, _, _ in rows]))
+            self._answers = [answer for _, answer, _ in rows]
+            self._stamps = [ts for _, _, ts in rows]
+
+    def _embed(self, question: str):
+        with self._lock:
+            if self._model is None:
+                self._load()
+        return self._model.encode(
+            [question.strip()], normalize_embeddings=True, convert_to_numpy=True
+        ).astype("float32")
+
+    def _lookup(self, vector) -> Optional[str]:
+        with self._lock:
+            if not self._answers:
+                return None
+            scores, ids = self._index.search(vector, min(self.top_k, len(self._answers)))
+            cutoff = time.time() - self.ttl
+            # Best match first; stop at the first neighbour that is close enough and still fresh
+            for score, i in zip(scores[0], ids[0]):
+                if score < self.threshold:
+                    break
+                if self._stamps[i] >= cutoff:
+                    return self._answers[i]
+            return None
+
+    def _embed_and_lookup(self, question: str):
+        vector = self._embed(question)
+        return vector, self._lookup(vector)
+
+    def _store(self, vector, answer: str) -> None:
+        now = int(time.time())
+        name = self.inner.name
+        with self._lock:
+            self._index.add(vector)
+            self._answers.append(answer)
+            self._stamps.append(now)
+            try:
+                with self._connect() as db:
+                    db.execute(
+                        "INSERT INTO semcache VALUES (?, ?, ?, ?)",
+                        (name, vector[0].tobytes(), answer, now),
+                    )
+                    db.execute("DELETE FROM semcache WHERE ts < ?", (now - self.ttl,))
+                    # The cap is per provider, so one busy backend can't evict the others
+                    db.execute(
+                        "DELETE FROM semcache WHERE name = ? AND rowid NOT IN "
+                        "(SELECT rowid FROM semcache WHERE name = ? ORDER BY ts DESC LIMIT ?)",
+                        (name, name, self.max_entries),
+                    )
+            except sqlite3.Error:
+                pass
+
+    def ask(self, question: str) -> str:
+        vector, answer = self._embed_and_lookup(question)
+        if answer is None:
+            answer = self.inner.ask(question)
+            self._store(vector, answer)
+        return answer
+
+    async def ask_async(self, question: str) -> str:
+        # Model load, embedding and SQLite are blocking; keep them off the event loop
+        # so concurrent asks overlap and the HTTP request isn't left waiting behind them
+        vector, answer = await asyncio.to_thread(self._embed_and_lookup, question)
+        if answer is None:
+            answer = await self.inner.ask_async(question)
+            await asyncio.to_thread(self._store, vector, answer)
+        return answer
+
+
+# ---------------------------------------------------------------------------
+# Request timeout
+# ---------------------------------------------------------------------------
+
+def _timeout_errors() -> tuple[type[BaseException], ...]:
+    """What a timed-out request raises: httpx's error, or the SDK wrappers around it."""
+    errors: list[type[BaseException]] = [httpx.TimeoutException]
+    for mod in (_openai_mod, _anthropic_mod):
+        if mod is not None:
+            errors.append(mod.APITimeoutError)
+    return tuple(errors)
+
+
+class TimeoutProvider(AIProvider):
+    """
+    Gives the AI a deadline, then one more (twice as long) before giving up on it.
+
+    ask() hands the deadline to the shared clients as a per-request timeout;
+    ask_async(), used for batches, bounds the whole coroutine with wait_for.
+    """
+
+    def __init__(self, inner: AIProvider, timeout: float = 8.0):
+        if timeout <= 0:
+            raise ValueError(f"Timeout must be positive, got {timeout:g}")
+        self.inner = inner
+        self.timeout = timeout
+
+    @property
+    def name(self) -> str:
+        return self.inner.name
+
+    def ask(self, question: str) -> str:
+        # No event loop, so repeated asks keep reusing the pooled keep-alive sockets
+        for timeout in (self.timeout, 2 * self.timeout):
+            token = _request_timeout.set(timeout)
+            try:
+                return self.inner.ask(question)
+            except _timeout_errors():
+                pass
+            finally:
+                _request_timeout.reset(token)
+        raise TimeoutError(
+            f"No answer after {self.timeout:g}s and a {2 * self.timeout:g}s retry"
+        )
+
+    async def ask_async(self, question: str) -> str:
+        try:
+            return await asyncio.wait_for(self.inner.ask_async(question), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            pass
+        try:
+            return await asyncio.wait_for(self.inner.ask_async(question), timeout=2 * self.timeout)
+        except asyncio.TimeoutError:
+            raise TimeoutError(
+                f"No answer after {self.timeout:g}s and a {2 * self.timeout:g}s retry"
+            ) from None
+
+
 # ---------------------------------------------------------------------------
 # Factory
 # ---------------------------------------------------------------------------
 
+_PROVIDER_TABLE: dict[str, type[AIProvider]] = {
+    "ollama": OllamaProvider,
+    "lmstudio": LMStudioProvider,
+    "lm_studio": LMStudioProvider,
+    "lm-studio": LMStudioProvider,
+    "openai": OpenAIProvider,
+    "chatgpt": OpenAIProvider,
+    "claude": ClaudeProvider,
+    "anthropic": ClaudeProvider,
+    "offline": OfflineProvider,
+    "none": OfflineProvider,
+    "": OfflineProvider,
+}
+
+# Providers that refuse to answer without an API key, and how they complain about it
+_REQUIRES_KEY: dict[type[AIProvider], str] = {
+    OpenAIProvider: "OpenAI provider requires an API key (--api-key or OPENAI_API_KEY env var)",
+    ClaudeProvider: "Claude provider requires an API key (--api-key or ANTHROPIC_API_KEY env var)",
+}
+
+
 def build_provider(
     provider: str,
     api_key: Optional[str] = None,
     base_url: Optional[str] = None,
     model: Optional[str] = None,
+    cache: bool = True,
+    timeout: Optional[float] = None,
+    semantic_cache: bool = False,
 ) -> AIProvider:
-    """Build an AI provider from config."""
-    p = provider.lower()
-
-    if p == "ollama":
-        kwargs = {}
-        if base_url:
-            kwargs["base_url"] = base_url
-        if model:
-            kwargs["model"] = model
-        return OllamaProvider(**kwargs)
-
-    elif p in ("lmstudio", "lm_studio", "lm-studio"):
-        kwargs = {}
-        if base_url:
-            kwargs["base_url"] = base_url
-        if model:
-            kwargs["model"] = model
-        return LMStudioProvider(**kwargs)
-
-    elif p in ("openai", "chatgpt"):
-        if not api_key:
-            raise ValueError("OpenAI provider requires an API key (--api-key or OPENAI_API_KEY env var)")
-        kwargs = {"api_key": api_key}
-        if model:
-            kwargs["model"] = model
-        return OpenAIProvider(**kwargs)
-
-    elif p in ("claude", "anthropic"):
-        if not api_key:
-            raise ValueError("Claude provider requires an API key (--api-key or ANTHROPIC_API_KEY env var)")
-        kwargs = {"api_key": api_key}
-        if model:
-            kwargs["model"] = model
-        return ClaudeProvider(**kwargs)
-
-    elif p in ("offline", "none", ""):
-        return OfflineProvider()
-
-    else:
+    """
+    Build an AI provider from config.
+
+    Real providers are wrapped in the response cache unless ``cache`` is False,
+    behind an embedding-based cache when ``semantic_cache`` is True, and bounded
+    by ``timeout`` seconds (with one doubled retry) when given.
+    """
+    real = _build_uncached(provider, api_key=api_key, base_url=base_url, model=model)
+    if isinstance(real, OfflineProvider):
+        return real
+    if semantic_cache:
+        real = SemanticCachingProvider(real)
+    if cache:
+        real = CachingProvider(real)
+    if timeout is not None:
+        real = TimeoutProvider(real, timeout)
+    return real
+
+
+def _build_uncached(
+    provider: str,
+    api_key: Optional[str] = None,
+    base_url: Optional[str] = None,
+    model: Optional[str] = None,
+) -> AIProvider:
+    cls = _PROVIDER_TABLE.get(provider.lower())
+    if cls is None:
         raise ValueError(
             f"Unknown AI provider: '{provider}'. "
             f"Choose from: ollama, lmstudio, openai/chatgpt, claude/anthropic, offline"
         )
+    if cls is OfflineProvider:
+        return OfflineProvider()
+
+    kwargs = {}
+    if cls in _REQUIRES_KEY:
+        if not api_key:
+            raise ValueError(_REQUIRES_KEY[cls])
+        kwargs["api_key"] = api_key
+    elif base_url:
+        kwargs["base_url"] = base_url
+    if model:
+        kwargs["model"] = model
+    return cls(**kwargs)
@@ -6,17 +6,17 @@ from __future__ import annotations
 
 import os
 import sys
+from dataclasses import dataclass
 from typing import Optional
 
 import click
 from rich.console import Console
+from rich.markup import escape
 from rich.panel import Panel
-from rich.table import Table
-from rich import box
+from rich.text import Text
 
 from redteamoracle import __version__
-from redteamoracle.oracle import consult_oracle, _clear_lockout
-from redteamoracle.ai import build_provider, OfflineProvider
+from redteamoracle.oracle import consult_oracle, consult_oracle_many, _clear_lockout
 from redteamoracle.modules import get_module, list_modules
 
 console = Console()
@@ -37,36 +37,90 @@ BANNER = r"""
 
 TAGLINE = "[dim]v{version} — The oracle decides if you're worthy today.[/dim]".format(version=__version__)
 
+# Parsed once at import so print_banner skips Rich's markup parser
+_BANNER_RENDERABLE = Text.from_markup(BANNER)
+_TAGLINE_RENDERABLE = Text.from_markup(f"  {TAGLINE}\n")
 
 def print_banner() -> None:
-    console.print(BANNER)
-    console.print(f"  {TAGLINE}\n", justify="center")
+    """Show the banner, but only to humans — piped and scripted runs skip it."""
+    if not console.is_terminal:
+        return
+    console.print(_BANNER_RENDERABLE)
+    console.print(_TAGLINE_RENDERABLE, justify="center")
 
 
-def _resolve_provider(provider: str, api_key: Optional[str], base_url: Optional[str], model: Optional[str]):
+_OFFLINE_SINGLETON = None
+
+_OPENAI_NAMES = frozenset({"openai", "chatgpt"})
+_ANTHROPIC_NAMES = frozenset({"claude", "anthropic"})
+
+
+def _offline_provider():
+    """The offline oracle is stateless, so one instance serves the whole process."""
+    global _OFFLINE_SINGLETON
+    if _OFFLINE_SINGLETON is None:
+        from redteamoracle.ai import OfflineProvider
+
+        _OFFLINE_SINGLETON = OfflineProvider()
+    return _OFFLINE_SINGLETON
+
+
+def _resolve_provider(provider: str, api_key: Optional[str], base_url: Optional[str], model: Optional[str],
+                      cache: bool = True, request_timeout: Optional[float] = None,
+                      semantic_cache: bool = False):
     """Resolve AI provider, falling back to offline if nothing configured."""
+    # The default: no env lookups, no factory
+    if not provider or provider.lower() == "offline":
+        return _offline_provider()
+
+    from redteamoracle.ai import build_provider
+
     # Try env vars as fallback for API keys
     if not api_key:
-        if provider in ("openai", "chatgpt"):
+        if provider in _OPENAI_NAMES:
             api_key = os.environ.get("OPENAI_API_KEY")
-        elif provider in ("claude", "anthropic"):
+        elif provider in _ANTHROPIC_NAMES:
             api_key = os.environ.get("ANTHROPIC_API_KEY")
 
-    if not provider or provider == "offline":
-        return OfflineProvider()
+    # A missing optional extra costs the semantic layer, not the whole provider
+    if semantic_cache:
+        from redteamoracle.ai import _semcache_missing
+
+        missing = _semcache_missing()
+        if missing:
+            hint = escape("pip install 'redteamoracle[semcache]'")
+            console.print(
+                f"[yellow]⚠  Semantic cache disabled: {', '.join(missing)} not installed ({hint})[/yellow]"
+            )
+            semantic_cache = False
 
     try:
-        return build_provider(provider, api_key=api_key, base_url=base_url, model=model)
+        return build_provider(provider, api_key=api_key, base_url=base_url, model=model,
+                              cache=cache, timeout=request_timeout, semantic_cache=semantic_cache)
     except Exception as e:
-        console.print(f"[yellow]⚠  Could not initialize AI provider: {e}[/yellow]")
+        console.print(f"[yellow]⚠  Could not initialize AI provider: {escape(str(e))}[/yellow]")
         console.print("[dim]Falling back to offline oracle responses.[/dim]")
-        return OfflineProvider()
+        return _offline_provider()
 
 
 # ---------------------------------------------------------------------------
 # CLI
 # ---------------------------------------------------------------------------
 
+@dataclass(slots=True, frozen=True)
+class CliCtx:
+    """Global options, handed to every subcommand via ``ctx.obj``."""
+
+    provider: str
+    api_key: Optional[str]
+    base_url: Optional[str]
+    model: Optional[str]
+    no_cache: bool
+    semantic_cache: bool
+    request_timeout: float
+    skip_oracle: bool
+
+
 @click.group(invoke_without_command=True)
 @click.version_option(__version__, prog_name="redteamoracle")
 @click.option("--provider", "-p", default="offline",
@@ -79,11 +133,18 @@ def _resolve_provider(provider: str, api_key: Optional[str], base_url: Optional[
               help="Base URL for local AI providers (Ollama, LMStudio).")
 @click.option("--model", "-m", default=None,
               help="AI model to use (provider-specific).")
+@click.option("--no-cache", is_flag=True, default=False,
+              help="Always ask the AI fresh instead of reusing cached answers.")
+@click.option("--semantic-cache", is_flag=True, default=False,
+              help="Also reuse answers to similar questions (needs the 'semcache' extra).")
+@click.option("--request-timeout", type=click.FloatRange(min=0, min_open=True), default=8.0, show_default=True,
+              help="Seconds to wait for the AI before retrying once with double the patience.")
 @click.option("--skip-oracle", is_flag=True, default=False, hidden=True,
               help="Bypass the oracle (coward mode).")
 @click.pass_context
 def main(ctx: click.Context, provider: str, api_key: Optional[str],
-         base_url: Optional[str], model: Optional[str], skip_oracle: bool) -> None:
+         base_url: Optional[str], model: Optional[str], no_cache: bool, semantic_cache: bool,
+         request_timeout: float, skip_oracle: bool) -> None:
     """
     \b
     redteamoracle — Agentic Red Team Framework
@@ -95,12 +156,16 @@ def main(ctx: click.Context, provider: str, api_key: Optional[str],
     """
     print_banner()
 
-    ctx.ensure_object(dict)
-    ctx.obj["provider"] = provider
-    ctx.obj["api_key"] = api_key
-    ctx.obj["base_url"] = base_url
-    ctx.obj["model"] = model
-    ctx.obj["skip_oracle"] = skip_oracle
+    ctx.obj = CliCtx(
+        provider=provider,
+        api_key=api_key,
+        base_url=base_url,
+        model=model,
+        no_cache=no_cache,
+        semantic_cache=semantic_cache,
+        request_timeout=request_timeout,
+        skip_oracle=skip_oracle,
+    )
 
     # Show help if no subcommand given
     if ctx.invoked_subcommand is None:
@@ -113,19 +178,37 @@ def main(ctx: click.Context, provider: str, api_key: Optional[str],
 
 @main.command("run")
 @click.argument("module_name", metavar="MODULE")
-@click.option("--target", "-t", required=True, help="Target host/domain/IP")
+@click.option("--target", "-t", default=None, help="Target host/domain/IP")
+@click.option("--targets-file", "-T", default=None, type=click.Path(exists=True, dir_okay=False),
+              help="File with one target per line; one oracle roll decides them all.")
 @click.option("--ports", default="top-100", show_default=True, help="Port range (for scan module)")
 @click.option("--cve", default=None, help="Specific CVE to target (for exploit module)")
 @click.pass_context
-def run_module(ctx: click.Context, module_name: str, target: str, ports: str, cve: Optional[str]) -> None:
+def run_module(ctx: click.Context, module_name: str, target: Optional[str], targets_file: Optional[str],
+               ports: str, cve: Optional[str]) -> None:
     """Run a pentest module against a target. (Subject to oracle approval.)"""
     obj = ctx.obj
 
+    targets = [target] if target else []
+    if targets_file:
+        with open(targets_file, encoding="utf-8") as fh:
+            targets.extend(
+                line.strip() for line in fh
+                if line.strip() and not line.lstrip().startswith("#")
+            )
+    # Listing a host twice must not earn it a second roll or a second run
+    targets = list(dict.fromkeys(targets))
+    if not targets:
+        console.print("[red]No target given. Use --target or --targets-file.[/red]")
+        sys.exit(1)
+
     # Oracle check — runs every single time
-    if not obj.get("skip_oracle"):
-        ai = _resolve_provider(obj["provider"], obj["api_key"], obj["base_url"], obj["model"])
+    if not obj.skip_oracle:
+        ai = _resolve_provider(obj.provider, obj.api_key, obj.base_url, obj.model,
+                               cache=not obj.no_cache, request_timeout=obj.request_timeout,
+                               semantic_cache=obj.semantic_cache)
         console.print(f"[dim]Oracle AI: {ai.name}[/dim]")
-        allowed = consult_oracle(ai)
+        allowed = consult_oracle(ai) if len(targets) == 1 else consult_oracle_many(ai, targets)
         if not allowed:
             sys.exit(1)
 
@@ -136,7 +219,8 @@ def run_module(ctx: click.Context, module_name: str, target: str, ports: str, cv
         console.print("Run [bold]redteamoracle modules[/bold] to see available modules.")
         sys.exit(1)
 
-    module.run(target=target, ports=ports, cve=cve)
+    for t in targets:
+        module.run(target=t, ports=ports, cve=cve)
 
 
 # ---------------------------------------------------------------------------
@@ -144,8 +228,22 @@ def run_module(ctx: click.Context, module_name: str, target: str, ports: str, cv
 # ---------------------------------------------------------------------------
 
 @main.command("modules")
-def list_modules_cmd() -> None:
+@click.option("--filter", "-f", "pattern", default=None,
+              help="Only show modules whose name or description contains this text.")
+@click.option("--limit", "-n", default=None, type=click.IntRange(min=1),
+              help="Show at most this many modules.")
+def list_modules_cmd(pattern: Optional[str], limit: Optional[int]) -> None:
     """List all available pentest modules."""
+    from rich import box
+    from rich.table import Table
+
+    mods = list_modules()
+    if pattern:
+        needle = pattern.lower()
+        mods = [m for m in mods if needle in m.name.lower() or needle in m.description.lower()]
+    if limit:
+        mods = mods[:limit]
+
     table = Table(
         title="Available Modules",
         box=box.ROUNDED,
@@ -154,9 +252,9 @@ def list_modules_cmd() -> None:
     )
     table.add_column("Name", style="bold green", no_wrap=True)
     table.add_column("Description", style="white")
-    table.add_column("Author", style="dim", justify="right")
+    table.add_column("Author", style="dim", justify="right", no_wrap=True)
 
-    for mod in list_modules():
+    for mod in mods:
         table.add_row(mod.name, mod.description, mod.author)
 
     console.print(table)
@@ -170,37 +268,42 @@ def list_modules_cmd() -> None:
 # status command
 # ---------------------------------------------------------------------------
 
+_CLEAR_PANEL = Panel.fit(
+    Text.from_markup(
+        "[bold green]✅  STATUS: CLEAR[/bold green]\n\n"
+        "[green]The oracle has not cursed you yet today.\n"
+        "Run a module and find out if that changes.[/green]"
+    ),
+    border_style="green",
+)
+
+
 @main.command("status")
 @click.pass_context
 def status_cmd(ctx: click.Context) -> None:
     """Check oracle lockout status."""
-    from redteamoracle.oracle import _is_locked_out, _load_state
+    from redteamoracle.oracle import _is_locked_out
+    import time
     from datetime import datetime
 
     locked_until = _is_locked_out()
-    state = _load_state()
 
     if locked_until:
-        remaining = locked_until - datetime.now()
-        hours, r = divmod(int(remaining.total_seconds()), 3600)
+        hours, r = divmod(int(locked_until - time.time()), 3600)
         minutes = r // 60
         console.print(
             Panel.fit(
-                f"[bold red]🔒  LOCKED OUT[/bold red]\n\n"
-                f"Remaining: [bold]{hours}h {minutes}m[/bold]\n"
-                f"Expires:   {locked_until.strftime('%Y-%m-%d %H:%M:%S')}",
+                Text.assemble(
+                    ("🔒  LOCKED OUT", "bold red"),
+                    "\n\nRemaining: ",
+                    (f"{hours}h {minutes}m", "bold"),
+                    f"\nExpires:   {datetime.fromtimestamp(locked_until):%Y-%m-%d %H:%M:%S}",
+                ),
                 border_style="red",
             )
         )
     else:
-        console.print(
-            Panel.fit(
-                "[bold green]✅  STATUS: CLEAR[/bold green]\n\n"
-                "[green]The oracle has not cursed you yet today.\n"
-                "Run a module and find out if that changes.[/green]",
-                border_style="green",
-            )
-        )
+        console.print(_CLEAR_PANEL)
 
 
 # ---------------------------------------------------------------------------
@@ -212,7 +315,9 @@ def status_cmd(ctx: click.Context) -> None:
 def oracle_cmd(ctx: click.Context) -> None:
     """Manually consult the oracle without running a module."""
     obj = ctx.obj
-    ai = _resolve_provider(obj["provider"], obj["api_key"], obj["base_url"], obj["model"])
+    ai = _resolve_provider(obj.provider, obj.api_key, obj.base_url, obj.model,
+                           cache=not obj.no_cache, request_timeout=obj.request_timeout,
+                           semantic_cache=obj.semantic_cache)
     console.print(f"[dim]Oracle AI: {ai.name}[/dim]")
     allowed = consult_oracle(ai)
     if not allowed:
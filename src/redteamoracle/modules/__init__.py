@@ -7,15 +7,65 @@ from __future__ import annotations
 
 import random
 import time
-from typing import Optional
+from itertools import accumulate
+from typing import TYPE_CHECKING, Optional, Sequence
 
 from rich.console import Console
-from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TimeElapsedColumn
-from rich.table import Table
-from rich import box
+from rich.style import Style
+from rich.text import Text
+
+# Progress, Table and box are imported inside run()/_make_table, so merely
+# importing the modules (e.g. to list them) doesn't pay for them
+if TYPE_CHECKING:
+    from rich.progress import Progress, TaskID
+    from rich.table import Table
 
 console = Console()
 
+# Cell styles, parsed once; rows built from Text(..., style=...) skip markup parsing
+_GREEN = Style(color="green")
+_RED = Style(color="red")
+_YELLOW = Style(color="yellow")
+
+# Longest single sleep while waiting out a phase (~25 fps, Rich's redraw cadence)
+_FRAME = 0.04
+
+
+def _phased_sleep(
+    progress: Progress,
+    task: TaskID,
+    phases: list[tuple[str, float]],
+    advance: bool = False,
+) -> None:
+    """
+    Wait through (description, seconds) phases against one monotonic schedule.
+
+    The task's description switches as each phase starts; with ``advance`` the
+    task also ticks forward as each phase ends.
+    """
+    start = time.monotonic()
+    deadlines = [start + d for d in accumulate(seconds for _, seconds in phases)]
+    for (description, _), deadline in zip(phases, deadlines):
+        progress.update(task, description=description)
+        while (remaining := deadline - time.monotonic()) > 0:
+            time.sleep(min(_FRAME, remaining))
+        if advance:
+            progress.advance(task)
+
+
+def _floyd_sample(pool: Sequence, k: int) -> list:
+    """
+    Draw k distinct items from pool with Floyd's algorithm: k RNG calls, no pool copy.
+
+    Unlike random.sample, the picks come back in pool order; shuffle them if that matters.
+    """
+    n = len(pool)
+    seen: set[int] = set()
+    for j in range(n - k, n):
+        t = random.randint(0, j)
+        seen.add(j if t in seen else t)
+    return [pool[i] for i in sorted(seen)]
+
 
 # ---------------------------------------------------------------------------
 # Base Module
@@ -46,18 +96,33 @@ class ReconModule(BaseModule):
     description = "Passive and active reconnaissance against a target"
     author = "The Oracle"
 
-    FAKE_SUBDOMAINS = [
+    FAKE_SUBDOMAINS = (
         "dev", "staging", "admin", "api", "mail", "vpn", "remote",
         "test", "old", "backup", "portal", "internal", "db", "jenkins",
         "gitlab", "jira", "confluence", "legacy", "beta", "support",
-    ]
+    )
 
-    FAKE_TECH = [
+    FAKE_TECH = (
         "Apache/2.4.51", "nginx/1.18.0", "Microsoft-IIS/10.0",
         "Express/4.18.2", "Werkzeug/2.3.0", "Tomcat/9.0.65",
-    ]
+    )
+
+    STATUSES = ("🟢 Online", "🟡 Filtered", "🔴 Offline")
+
+    @classmethod
+    def _make_table(cls, title: str) -> Table:
+        from rich import box
+        from rich.table import Table
+
+        table = Table(title=title, box=box.ROUNDED, border_style="cyan")
+        table.add_column("Subdomain", style="green")
+        table.add_column("IP", style="yellow")
+        table.add_column("Status", style="white")
+        return table
 
     def run(self, target: str, **kwargs) -> None:
+        from rich.progress import Progress, SpinnerColumn, TextColumn, TimeElapsedColumn
+
         console.print(f"\n[bold cyan]🔍 Recon Module[/bold cyan] → target: [yellow]{target}[/yellow]\n")
 
         with Progress(
@@ -65,30 +130,28 @@ class ReconModule(BaseModule):
             TextColumn("[progress.description]{task.description}"),
             TimeElapsedColumn(),
             console=console,
+            refresh_per_second=10,
+            transient=True,
         ) as progress:
             task = progress.add_task("[cyan]Enumerating subdomains...", total=None)
-            time.sleep(random.uniform(1.5, 2.5))
-            progress.update(task, description="[cyan]Querying passive DNS...")
-            time.sleep(random.uniform(0.8, 1.5))
-            progress.update(task, description="[cyan]Checking certificate transparency logs...")
-            time.sleep(random.uniform(0.5, 1.2))
-            progress.update(task, description="[cyan]Fingerprinting web technologies...")
-            time.sleep(random.uniform(0.6, 1.0))
+            _phased_sleep(progress, task, [
+                ("[cyan]Enumerating subdomains...", random.uniform(1.5, 2.5)),
+                ("[cyan]Querying passive DNS...", random.uniform(0.8, 1.5)),
+                ("[cyan]Checking certificate transparency logs...", random.uniform(0.5, 1.2)),
+                ("[cyan]Fingerprinting web technologies...", random.uniform(0.6, 1.0)),
+            ])
             progress.remove_task(task)
 
         # Fake results
         found = random.sample(self.FAKE_SUBDOMAINS, random.randint(4, 8))
         tech = random.choice(self.FAKE_TECH)
 
-        table = Table(title=f"Recon Results — {target}", box=box.ROUNDED, border_style="cyan")
-        table.add_column("Subdomain", style="green")
-        table.add_column("IP", style="yellow")
-        table.add_column("Status", style="white")
+        table = self._make_table(f"Recon Results — {target}")
 
         for sub in found:
-            ip = f"10.{random.randint(0,255)}.{random.randint(0,255)}.{random.randint(1,254)}"
-            status = random.choice(["🟢 Online", "🟡 Filtered", "🔴 Offline"])
-            table.add_row(f"{sub}.{target}", ip, status)
+            ip = f"10.{random.getrandbits(8)}.{random.getrandbits(8)}.{random.randint(1, 254)}"
+            status = random.choice(self.STATUSES)
+            table.add_row(Text(f"{sub}.{target}"), Text(ip), Text(status))
 
         console.print(table)
         console.print(f"\n[dim]Detected server: {tech}[/dim]")
@@ -127,11 +190,29 @@ class ScannerModule(BaseModule):
         27017: ("MongoDB", "MongoDB 5.0.3"),
     }
 
+    _SORTED_PORTS: tuple[int, ...] = tuple(sorted(COMMON_PORTS))
+
+    @classmethod
+    def _make_table(cls, title: str) -> Table:
+        from rich import box
+        from rich.table import Table
+
+        table = Table(title=title, box=box.ROUNDED, border_style="cyan")
+        table.add_column("Port", style="bold white", justify="right")
+        table.add_column("State", style="white")
+        table.add_column("Service", style="cyan")
+        table.add_column("Version", style="dim")
+        return table
+
     def run(self, target: str, ports: str = "top-100", **kwargs) -> None:
+        from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn
+
         console.print(f"\n[bold cyan]🔌 Port Scanner Module[/bold cyan] → target: [yellow]{target}[/yellow]\n")
 
-        port_list = list(self.COMMON_PORTS.keys())
-        to_scan = random.sample(port_list, min(len(port_list), 10))
+        # The sampled indices come back in order, so to_scan stays in port order
+        ports_total = len(self._SORTED_PORTS)
+        indices = _floyd_sample(range(ports_total), min(ports_total, 10))
+        to_scan = [self._SORTED_PORTS[i] for i in indices]
 
         with Progress(
             SpinnerColumn(),
@@ -139,6 +220,8 @@ class ScannerModule(BaseModule):
             BarColumn(),
             TextColumn("[progress.percentage]{task.percentage:>3.0f}%"),
             console=console,
+            refresh_per_second=10,
+            transient=True,
         ) as progress:
             task = progress.add_task("[cyan]Scanning ports...", total=len(to_scan))
             for port in to_scan:
@@ -146,19 +229,16 @@ class ScannerModule(BaseModule):
                 progress.advance(task)
 
         # Show results
-        open_ports = random.sample(to_scan, random.randint(2, 5))
+        open_ports = set(random.sample(to_scan, random.randint(2, 5)))
 
-        table = Table(title=f"Scan Results — {target}", box=box.ROUNDED, border_style="cyan")
-        table.add_column("Port", style="bold white", justify="right")
-        table.add_column("State", style="white")
-        table.add_column("Service", style="cyan")
-        table.add_column("Version", style="dim")
+        table = self._make_table(f"Scan Results — {target}")
 
-        for port in sorted(to_scan):
-            state = "[green]open[/green]" if port in open_ports else "[red]closed[/red]"
+        for port in to_scan:
+            is_open = port in open_ports
+            state = Text("open", style=_GREEN) if is_open else Text("closed", style=_RED)
             service, version = self.COMMON_PORTS[port]
-            version_str = version if port in open_ports else ""
-            table.add_row(str(port), state, service, version_str)
+            version_str = version if is_open else ""
+            table.add_row(Text(str(port)), state, Text(service), Text(version_str))
 
         console.print(table)
         console.print(
@@ -181,7 +261,7 @@ class ExploitModule(BaseModule):
     description = "Automated vulnerability exploitation (educational purposes only)"
     author = "The Oracle"
 
-    FAKE_CVES = [
+    FAKE_CVES = (
         ("CVE-2021-44228", "Log4Shell", "Critical", 10.0),
         ("CVE-2021-34527", "PrintNightmare", "Critical", 8.8),
         ("CVE-2022-26134", "Confluence RCE", "Critical", 9.8),
@@ -189,17 +269,31 @@ class ExploitModule(BaseModule):
         ("CVE-2023-23397", "Outlook 0-click", "Critical", 9.8),
         ("CVE-2023-44487", "HTTP/2 Rapid Reset", "High", 7.5),
         ("CVE-2024-3400", "PAN-OS RCE", "Critical", 10.0),
-    ]
+    )
 
-    FAKE_OUTCOMES = [
+    FAKE_OUTCOMES = (
         "⚡ Exploit launched successfully... or did it?",
         "🎯 Session opened. Probably.",
         "💥 Target responded with something. Unclear what.",
         "🔓 Authentication bypassed. Server confused.",
         "📦 Payload delivered. Target is thinking about it.",
-    ]
+    )
+
+    @classmethod
+    def _make_table(cls, title: str) -> Table:
+        from rich import box
+        from rich.table import Table
+
+        table = Table(title=title, box=box.SIMPLE_HEAVY, border_style="yellow")
+        table.add_column("CVE", style="bold red")
+        table.add_column("Name", style="white")
+        table.add_column("Severity", style="bold")
+        table.add_column("CVSS", justify="right")
+        return table
 
     def run(self, target: str, cve: Optional[str] = None, **kwargs) -> None:
+        from rich.progress import Progress, SpinnerColumn, TextColumn, TimeElapsedColumn
+
         console.print(f"\n[bold red]💣 Exploit Module[/bold red] → target: [yellow]{target}[/yellow]\n")
         console.print("[dim yellow]⚠  EDUCATIONAL/AUTHORIZED USE ONLY ⚠[/dim yellow]\n")
 
@@ -209,25 +303,24 @@ class ExploitModule(BaseModule):
             SpinnerColumn(),
             TextColumn("[progress.description]{task.description}"),
             console=console,
+            refresh_per_second=10,
+            transient=True,
         ) as progress:
             task = progress.add_task("[cyan]Scanning for vulnerabilities...", total=None)
-            time.sleep(random.uniform(2.0, 3.5))
-            progress.update(task, description="[cyan]Correlating CVE database...")
-            time.sleep(random.uniform(0.8, 1.5))
+            _phased_sleep(progress, task, [
+                ("[cyan]Scanning for vulnerabilities...", random.uniform(2.0, 3.5)),
+                ("[cyan]Correlating CVE database...", random.uniform(0.8, 1.5)),
+            ])
             progress.remove_task(task)
 
         # Show fake vulns
         found_vulns = random.sample(self.FAKE_CVES, random.randint(1, 3))
 
-        vuln_table = Table(title="Potential Vulnerabilities", box=box.SIMPLE_HEAVY, border_style="yellow")
-        vuln_table.add_column("CVE", style="bold red")
-        vuln_table.add_column("Name", style="white")
-        vuln_table.add_column("Severity", style="bold")
-        vuln_table.add_column("CVSS", justify="right")
+        vuln_table = self._make_table("Potential Vulnerabilities")
 
         for cve_id, name, severity, cvss in found_vulns:
-            color = "red" if cvss >= 9.0 else "yellow"
-            vuln_table.add_row(cve_id, name, f"[{color}]{severity}[/{color}]", f"[{color}]{cvss}[/{color}]")
+            color = _RED if cvss >= 9.0 else _YELLOW
+            vuln_table.add_row(Text(cve_id), Text(name), Text(severity, style=color), Text(str(cvss), style=color))
 
         console.print(vuln_table)
 
@@ -240,13 +333,15 @@ class ExploitModule(BaseModule):
             TextColumn("[progress.description]{task.description}"),
             TimeElapsedColumn(),
             console=console,
+            refresh_per_second=10,
+            transient=True,
         ) as progress:
             task = progress.add_task("[red]Preparing exploit...", total=None)
-            time.sleep(random.uniform(1.0, 2.0))
-            progress.update(task, description="[red]Sending payload...")
-            time.sleep(random.uniform(0.8, 1.5))
-            progress.update(task, description="[red]Awaiting response...")
-            time.sleep(random.uniform(1.0, 2.0))
+            _phased_sleep(progress, task, [
+                ("[red]Preparing exploit...", random.uniform(1.0, 2.0)),
+                ("[red]Sending payload...", random.uniform(0.8, 1.5)),
+                ("[red]Awaiting response...", random.uniform(1.0, 2.0)),
+            ])
             progress.remove_task(task)
 
         outcome = random.choice(self.FAKE_OUTCOMES)
@@ -272,6 +367,8 @@ class OSINTModule(BaseModule):
     author = "The Oracle"
 
     def run(self, target: str, **kwargs) -> None:
+        from rich.progress import Progress, SpinnerColumn, TextColumn
+
         console.print(f"\n[bold cyan]🕵️  OSINT Module[/bold cyan] → target: [yellow]{target}[/yellow]\n")
 
         sources = [
@@ -289,12 +386,16 @@ class OSINTModule(BaseModule):
             SpinnerColumn(),
             TextColumn("[progress.description]{task.description}"),
             console=console,
+            refresh_per_second=10,
+            transient=True,
         ) as progress:
             task = progress.add_task("[cyan]Querying sources...", total=len(sources))
-            for source in sources:
-                progress.update(task, description=f"[cyan]Querying {source}...")
-                time.sleep(random.uniform(0.3, 0.8))
-                progress.advance(task)
+            _phased_sleep(
+                progress,
+                task,
+                [(f"[cyan]Querying {source}...", random.uniform(0.3, 0.8)) for source in sources],
+                advance=True,
+            )
 
         findings = [
             f"📧  {random.randint(3, 47)} email addresses exposed",
@@ -305,8 +406,11 @@ class OSINTModule(BaseModule):
             f"🔓  {random.randint(0, 3)} credentials in paste sites",
         ]
 
+        picks = _floyd_sample(findings, random.randint(3, 5))
+        random.shuffle(picks)
+
         console.print("\n[bold]OSINT Findings:[/bold]")
-        for finding in random.sample(findings, random.randint(3, 5)):
+        for finding in picks:
             console.print(f"  {finding}")
         console.print(
             f"\n[dim]Report generated. Correlation confidence: {random.randint(42, 97)}%[/dim]\n"
@@ -317,20 +421,18 @@ class OSINTModule(BaseModule):
 # Module Registry
 # ---------------------------------------------------------------------------
 
-ALL_MODULES: dict[str, type[BaseModule]] = {
-    "recon": ReconModule,
-    "scan": ScannerModule,
-    "exploit": ExploitModule,
-    "osint": OSINTModule,
+# Modules are stateless, so one shared instance each is enough
+ALL_MODULES: dict[str, BaseModule] = {
+    "recon": ReconModule(),
+    "scan": ScannerModule(),
+    "exploit": ExploitModule(),
+    "osint": OSINTModule(),
 }
 
 
 def get_module(name: str) -> Optional[BaseModule]:
-    cls = ALL_MODULES.get(name.lower())
-    if cls:
-        return cls()
-    return None
+    return ALL_MODULES.get(name.lower())
 
 
 def list_modules() -> list[BaseModule]:
-    return [cls() for cls in ALL_MODULES.values()]
+    return list(ALL_MODULES.values())
@@ -1,16 +1,22 @@
 
 
 import json
+import os
 import random
+import tempfile
 import time
-from datetime import datetime, timedelta
+from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
 from rich.console import Console
-from rich.panel import Panel
+from rich.markup import escape
 from rich.text import Text
-from rich import box
+
+try:
+    import orjson
+except ImportError:  # optional: pip install redteamoracle[fast]
+    orjson = None
 
 console = Console()
 
@@ -20,7 +26,10 @@ STATE_FILE = Path.home() / ".redteamoracle" / "oracle_state.json"
 # Probability of the oracle deciding it's not your day (0.0 - 1.0)
 DOOM_PROBABILITY = 0.42  # Carefully chosen by the oracle
 
-DOOM_MESSAGES = [
+# How long a doom roll locks you out: 24 hours, in seconds
+LOCKOUT_SECONDS = 86400.0
+
+DOOM_MESSAGES = (
     "It's not your day.",
     "The stars are misaligned. Try again tomorrow.",
     "Mercury is in retrograde. Obviously.",
@@ -31,9 +40,9 @@ DOOM_MESSAGES = [
     "The oracle rolled a 1. Critical failure.",
     "Nope. Just… nope.",
     "The vibes are off. Come back tomorrow.",
-]
+)
 
-NOT_PENTEST_DAY_MESSAGES = [
+NOT_PENTEST_DAY_MESSAGES = (
     "And frankly, it's not the best day for a pentest either.",
     "Your target is also having a bad day, so it evens out.",
     "The SOC team is probably awake today anyway.",
@@ -41,9 +50,9 @@ NOT_PENTEST_DAY_MESSAGES = [
     "The CVEs you need were patched this morning. Trust.",
     "Your Burp Suite would have crashed in 3 minutes. You're welcome.",
     "Even your wordlists feel uninspired today.",
-]
+)
 
-LAZY_QUESTIONS = [
+LAZY_QUESTIONS = (
     "What is the color of the sky?",
     "How many legs does a dog have?",
     "What sound does a cow make?",
@@ -59,44 +68,89 @@ LAZY_QUESTIONS = [
     "What color is a red traffic light?",
     "In which direction does the Earth spin? (Don't overthink it.)",
     "What do you put in a toaster to make toast?",
-]
+)
 
 
-def _load_state() -> dict:
-    STATE_FILE.parent.mkdir(parents=True, exist_ok=True)
-    if STATE_FILE.exists():
-        try:
-            return json.loads(STATE_FILE.read_text())
-        except Exception:
-            pass
-    return {}
+# Set once the state directory is known to exist, so saves skip the mkdir
+_STATE_DIR_READY = False
 
 
-def _save_state(state: dict) -> None:
-    STATE_FILE.parent.mkdir(parents=True, exist_ok=True)
-    STATE_FILE.write_text(json.dumps(state, indent=2))
+def _load_state() -> dict:
+    try:
+        raw = STATE_FILE.read_bytes()
+    except FileNotFoundError:
+        return {}
+    try:
+        return orjson.loads(raw) if orjson is not None else json.loads(raw)
+    except ValueError:
+        # Hand-edited or left over from a pre-atomic-write version
+        return {}
 
 
-def _is_locked_out() -> Optional[datetime]:
-    """Returns the lockout expiry time if the user is locked out, else None."""
-    state = _load_state()
+def _save_state(state: dict) -> None:
+    """Write state atomically: a killed process leaves the old file, never half a new one."""
+    global _STATE_DIR_READY
+    if not _STATE_DIR_READY:
+        STATE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        _STATE_DIR_READY = True
+    if orjson is not None:
+        data = orjson.dumps(state, option=orjson.OPT_INDENT_2)
+    else:
+        data = json.dumps(state, indent=2).encode()
+    # A unique temp name per writer, so concurrent runs never share a half-written file
+    tmp = tempfile.NamedTemporaryFile(
+        dir=STATE_FILE.parent, prefix=STATE_FILE.name, suffix=".tmp", delete=False
+    )
+    try:
+        with tmp:
+            tmp.write(data)
+        os.replace(tmp.name, STATE_FILE)
+    except BaseException:
+        os.unlink(tmp.name)
+        raise
+
+
+def _lockout_ts(state: dict) -> Optional[float]:
+    """Lockout expiry as a Unix timestamp, upgrading the old ISO ``locked_until`` key in place."""
+    if "locked_until_ts" in state:
+        return state["locked_until_ts"]
     if "locked_until" in state:
-        locked_until = datetime.fromisoformat(state["locked_until"])
-        if datetime.now() < locked_until:
-            return locked_until
-        else:
-            # Lockout expired, clean it up
-            del state["locked_until"]
-            _save_state(state)
+        ts = datetime.fromisoformat(state.pop("locked_until")).timestamp()
+        state["locked_until_ts"] = ts
+        return ts
     return None
 
 
-def _set_lockout() -> datetime:
-    """Sets a 24-hour lockout and returns the expiry time."""
+def _get_lockout(state: dict) -> tuple[Optional[float], bool]:
+    """
+    Returns ``(expiry, changed)``: the lockout expiry (Unix timestamp) if ``state``
+    holds an active lockout, else None, and whether ``state`` was modified.
+
+    An expired lockout is dropped and an old ISO key upgraded; saving is left to the caller.
+    """
+    changed = "locked_until" in state
+    locked_until = _lockout_ts(state)
+    if locked_until is not None and time.time() >= locked_until:
+        del state["locked_until_ts"]
+        return None, True
+    return locked_until, changed
+
+
+def _apply_lockout(state: dict) -> float:
+    """Records a 24-hour lockout in ``state`` and returns the expiry; saving is left to the caller."""
+    locked_until = time.time() + LOCKOUT_SECONDS
+    state.pop("locked_until", None)
+    state["locked_until_ts"] = locked_until
+    return locked_until
+
+
+def _is_locked_out() -> Optional[float]:
+    """Returns the lockout expiry (Unix timestamp) if the user is locked out, else None."""
     state = _load_state()
-    locked_until = datetime.now() + timedelta(hours=24)
-    state["locked_until"] = locked_until.isoformat()
-    _save_state(state)
+    locked_until, changed = _get_lockout(state)
+    if changed:
+        # Lockout expired or stored in the old format, clean it up
+        _save_state(state)
     return locked_until
 
 
@@ -104,6 +158,7 @@ def _clear_lockout() -> None:
     """Dev escape hatch — clears lockout."""
     state = _load_state()
     state.pop("locked_until", None)
+    state.pop("locked_until_ts", None)
     _save_state(state)
 
 
@@ -113,22 +168,26 @@ def _roll_dice() -> bool:
 
 
 def _animate_roll() -> None:
-    """Visual dice roll animation."""
-    import time
+    """Visual dice roll animation, redrawn in place by a single Live display."""
+    from rich.live import Live
 
-    dice_faces = ["⚀", "⚁", "⚂", "⚃", "⚄", "⚅"]
+    dice_faces = ("⚀", "⚁", "⚂", "⚃", "⚄", "⚅")
     console.print("\n[dim]The Oracle prepares to roll...[/dim]")
     time.sleep(0.6)
 
-    for i in range(10):
-        face = random.choice(dice_faces)
-        console.print(f"\r[bold yellow]  {face}  Rolling...  {face}[/bold yellow]", end="")
-        time.sleep(0.08 + i * 0.015)
-
-    console.print()  # newline after animation
+    txt = Text(style="bold yellow")
+    with Live(txt, console=console, refresh_per_second=15, transient=True):
+        deadline = time.monotonic() + 1.5
+        while time.monotonic() < deadline:
+            face = random.choice(dice_faces)
+            txt.plain = f"  {face}  Rolling...  {face}"
+            time.sleep(0.066)
 
 
 def _display_doom(ai_answer: str) -> None:
+    from rich import box
+    from rich.panel import Panel
+
     doom_msg = random.choice(DOOM_MESSAGES)
     pentest_msg = random.choice(NOT_PENTEST_DAY_MESSAGES)
 
@@ -146,6 +205,9 @@ def _display_doom(ai_answer: str) -> None:
 
 
 def _display_ai_question(question: str, answer: str) -> None:
+    from rich import box
+    from rich.panel import Panel
+
     console.print()
     console.print(
         Panel(
@@ -160,9 +222,11 @@ def _display_ai_question(question: str, answer: str) -> None:
     )
 
 
-def _display_lockout(locked_until: datetime) -> None:
-    remaining = locked_until - datetime.now()
-    hours, remainder = divmod(int(remaining.total_seconds()), 3600)
+def _display_lockout(locked_until: float) -> None:
+    from rich import box
+    from rich.panel import Panel
+
+    hours, remainder = divmod(int(locked_until - time.time()), 3600)
     minutes = remainder // 60
 
     console.print()
@@ -171,7 +235,7 @@ def _display_lockout(locked_until: datetime) -> None:
             f"[bold red]🔒  ACCESS DENIED  🔒[/bold red]\n\n"
             f"[red]The Oracle has already judged you.\n"
             f"You are locked out for[/red] [bold white]{hours}h {minutes}m[/bold white] [red]more.[/red]\n\n"
-            f"[dim]Lockout expires: {locked_until.strftime('%Y-%m-%d %H:%M:%S')}[/dim]\n\n"
+            f"[dim]Lockout expires: {datetime.fromtimestamp(locked_until):%Y-%m-%d %H:%M:%S}[/dim]\n\n"
             f"[dim italic]Use this time to read a book. Maybe not a hacking one.[/dim italic]",
             box=box.HEAVY,
             border_style="red",
@@ -180,18 +244,8 @@ def _display_lockout(locked_until: datetime) -> None:
     )
 
 
-def consult_oracle(ai_provider) -> bool:
-    """
-    The main oracle ritual.
-
-    Returns True if the user may proceed, False if they are doomed.
-    Also enforces existing lockouts from previous doom rolls.
-    """
-    # Check if already locked out from a previous session
-    locked_until = _is_locked_out()
-    if locked_until:
-        _display_lockout(locked_until)
-        return False
+def _display_consulting() -> None:
+    from rich.panel import Panel
 
     console.print()
     console.print(
@@ -203,26 +257,80 @@ def consult_oracle(ai_provider) -> bool:
         )
     )
 
-    _animate_roll()
 
-    doomed = _roll_dice()
+def _display_blessing() -> None:
+    from rich import box
+    from rich.panel import Panel
 
-    if not doomed:
-        # Lucky day
-        console.print()
-        lucky_face = "⚅"
-        console.print(
-            Panel.fit(
-                f"[bold green]{lucky_face}  THE ORACLE SMILES UPON YOU  {lucky_face}[/bold green]\n\n"
-                "[green]Today is your day. The stars align.\n"
-                "Go forth and enumerate things.[/green]\n\n"
-                "[dim](Don't mess it up)[/dim]",
-                border_style="green",
-                box=box.ROUNDED,
-                padding=(1, 3),
-            )
+    console.print()
+    lucky_face = "⚅"
+    console.print(
+        Panel.fit(
+            f"[bold green]{lucky_face}  THE ORACLE SMILES UPON YOU  {lucky_face}[/bold green]\n\n"
+            "[green]Today is your day. The stars align.\n"
+            "Go forth and enumerate things.[/green]\n\n"
+            "[dim](Don't mess it up)[/dim]",
+            border_style="green",
+            box=box.ROUNDED,
+            padding=(1, 3),
         )
-        return True
+    )
+
+
+def _display_new_lockout(locked_until: float) -> None:
+    from rich.panel import Panel
+
+    console.print()
+    console.print(
+        Panel.fit(
+            f"[bold red]You are now locked out for 24 hours.[/bold red]\n"
+            f"[dim]Lockout expires: {datetime.fromtimestamp(locked_until):%Y-%m-%d %H:%M:%S}[/dim]",
+            border_style="red",
+            padding=(0, 2),
+        )
+    )
+
+
+def _open_ritual() -> tuple[Optional[bool], dict]:
+    """
+    The part of the ritual shared by every caller: enforce an existing lockout, then roll.
+
+    Returns ``(verdict, state)``. The verdict is False when still locked out from a
+    previous session, True on a lucky roll, and None on doom, in which case the caller
+    asks the AI and records the lockout in ``state``. The state is read once, here, and
+    written at most once: here when the verdict is settled, by the caller otherwise.
+    """
+    state = _load_state()
+    locked_until, changed = _get_lockout(state)
+    if locked_until:
+        if changed:
+            _save_state(state)  # keep the upgraded lockout format
+        _display_lockout(locked_until)
+        return False, state
+
+    _display_consulting()
+    _animate_roll()
+
+    if not _roll_dice():
+        # Lucky day
+        if changed:
+            _save_state(state)  # drop the expired lockout
+        _display_blessing()
+        return True, state
+
+    return None, state
+
+
+def consult_oracle(ai_provider) -> bool:
+    """
+    The main oracle ritual.
+
+    Returns True if the user may proceed, False if they are doomed.
+    Also enforces existing lockouts from previous doom rolls.
+    """
+    verdict, state = _open_ritual()
+    if verdict is not None:
+        return verdict
 
     # DOOM PATH
     question = random.choice(LAZY_QUESTIONS)
@@ -238,16 +346,52 @@ def consult_oracle(ai_provider) -> bool:
     _display_ai_question(question, answer)
 
     # Lock them out
-    locked_until = _set_lockout()
+    locked_until = _apply_lockout(state)
+    _save_state(state)
+    _display_new_lockout(locked_until)
 
-    console.print()
-    console.print(
-        Panel.fit(
-            f"[bold red]You are now locked out for 24 hours.[/bold red]\n"
-            f"[dim]Lockout expires: {locked_until.strftime('%Y-%m-%d %H:%M:%S')}[/dim]",
-            border_style="red",
-            padding=(0, 2),
-        )
-    )
+    return False
+
+
+def consult_oracle_many(ai_provider, targets: list[str]) -> bool:
+    """
+    The oracle ritual for a whole list of targets.
+
+    One roll decides the whole run, so listing more targets buys no extra
+    chances. On doom each target gets a question, the distinct ones are sent to
+    the AI in a single batch, and nothing runs. Returns True if the user may proceed against all of them.
+    """
+    verdict, state = _open_ritual()
+    if verdict is not None:
+        return verdict
+
+    questions = [random.choice(LAZY_QUESTIONS) for _ in targets]
+    # Few questions, many targets: ask each distinct one once and share the answer
+    unique = list(dict.fromkeys(questions))
+
+    about = "something very important" if len(unique) == 1 else f"{len(unique)} very important things"
+    console.print(f"\n[dim yellow]The Oracle is consulting the AI about {about}...[/dim yellow]")
+
+    from redteamoracle.ai import run_async
+
+    try:
+        answers = run_async(ai_provider.ask_many(unique))
+    except Exception as e:
+        # One failure for the whole batch; say so once, not once per target
+        answers = []
+        failure = f"[The AI was also having a bad day: {e}]"
+
+    _display_doom(answers[0] if answers else failure)
+    for target in targets:
+        console.print(f"[bold red]☠  {target}[/bold red]")
+    if answers:
+        for question, answer in zip(unique, answers):
+            _display_ai_question(question, answer)
+    else:
+        console.print(f"\n[dim]{escape(failure)}[/dim]")
+
+    locked_until = _apply_lockout(state)
+    _save_state(state)
+    _display_new_lockout(locked_until)
 
     return False